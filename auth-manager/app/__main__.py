@@ -60,6 +60,8 @@ def entrypoint(host: str, port: int, workers: int, reload: bool, log_level: str)
         reload=reload,
         workers=workers if not reload else 1,
         log_level=log_level,
+        # uvloop comes with uvicorn[standard], fail loudly rather than fall back to asyncio
+        loop="uvloop",
         access_log=True,
         proxy_headers=True,
     )
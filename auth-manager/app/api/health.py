@@ -1,13 +1,15 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, status
-from sqlalchemy import text
+import asyncio
+
+from fastapi import APIRouter, FastAPI, Request, status
 from starlette.responses import RedirectResponse, Response
 from starlette.status import HTTP_302_FOUND
 
 from app.config import get_settings
 from app.core.logging import get_logger
-from app.dependencies import KeycloakDep, SessionDep
+from app.db.base import db_manager
+from app.dependencies import KeycloakDep
 from app.models.api import Ok
 from app.models.response import VersionResponse
 
@@ -17,22 +19,44 @@ router = APIRouter(tags=["service"])
 config = get_settings()
 
 
-@router.get("/health", status_code=status.HTTP_200_OK)
-async def health_check() -> str:
+HEALTH_OK = b'"OK"'
+# /version retries an unknown database version inline, keep that wait short
+VERSION_PROBE_TIMEOUT = 1
+
+
+async def load_database_version(app: FastAPI, timeout: float) -> str | None:
+    """Fetch the database server version into `app.state`.
+
+    It does not change while the app runs, so it is read once at startup. If the
+    database is unreachable then, it stays None and `/version` tries again.
+    """
+    try:
+        app.state.database_version = await asyncio.wait_for(
+            db_manager.server_version(), timeout=timeout
+        )
+    except Exception as ex:
+        app.state.database_version = None
+        logger.warning("database_version_unavailable", error=str(ex) or type(ex).__name__)
+    return app.state.database_version
+
+
+@router.get("/health", status_code=status.HTTP_200_OK, response_model=str)
+async def health_check() -> Response:
     """Basic health check endpoint."""
-    logger.debug("health_check")
-    return "OK"
+    return Response(content=HEALTH_OK, media_type="application/json")
 
 
 @router.get(
     "/version",
 )
-async def version(db: SessionDep, kc: KeycloakDep) -> Ok[VersionResponse]:
+async def version(request: Request, kc: KeycloakDep) -> Ok[VersionResponse]:
     """Version endpoint providing basic service information."""
-    result = await db.execute(text("SELECT version();"))
-    database_version = result.scalar_one()
 
-    return Ok(
+    database_version = getattr(request.app.state, "database_version", None)
+    if database_version is None:
+        database_version = await load_database_version(request.app, timeout=VERSION_PROBE_TIMEOUT)
+
+    return Ok.model_construct(
         data=VersionResponse(
             app_name=config.app_name,
             app_version=config.app_version,
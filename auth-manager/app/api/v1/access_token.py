@@ -1,12 +1,12 @@
 """Access token endpoint."""
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, BackgroundTasks, Query, status
 from pydantic import UUID4
 
 from app.core.guards import guard_auth_error
 from app.core.logging import get_logger
 from app.core.security import ValidatedTokenDep
-from app.dependencies import KeycloakDep, TokenVaultServiceDep
+from app.dependencies import KeycloakDep, RefreshTokenPersisterDep, TokenVaultServiceDep
 from app.models.api import Ok
 from app.models.response import AccessTokenResult, ValidationErrorResponse
 
@@ -27,6 +27,8 @@ async def get_access_token(
     _: ValidatedTokenDep,
     keycloak: KeycloakDep,
     vault: TokenVaultServiceDep,
+    persist_refresh_token: RefreshTokenPersisterDep,
+    background: BackgroundTasks,
     id: UUID4 = Query(..., description="Persistent token id (uuid)"),
 ) -> Ok[AccessTokenResult]:
     """Get a fresh access token using a stored refresh/offline token.
@@ -42,6 +44,8 @@ async def get_access_token(
         validated_token: Validated token with user information (from ValidatedTokenDep)
         keycloak: Keycloak service dependency
         vault: Token vault service dependency
+        persist_refresh_token: Background upsert of the rotated refresh token
+        background: Background tasks, used to persist the rotated refresh token
         id: Persistent token id (uuid) from query parameter
 
     Returns:
@@ -69,14 +73,16 @@ async def get_access_token(
         dec = await keycloak.decode_token(token_response.refresh_token)
         # Note: only upsert the refresh token (offline already has long-life)
         if dec.typ == "Refresh":
-            await vault.upsert_refresh_token(
+            # the response does not depend on the upsert, do not make the client wait for it
+            background.add_task(
+                persist_refresh_token,
                 user_id=entry.user_id,
                 token=token_response.refresh_token,
                 session_state_id=token_response.session_state,
                 attributes=entry.attributes,
             )
 
-    return Ok(
+    return Ok.model_construct(
         data=AccessTokenResult(
             access_token=token_response.access_token,
             expires_in=token_response.expires_in,
@@ -1,11 +1,10 @@
 """Offline token consent and callback endpoints."""
 
-import secrets
 from typing import Optional
+from urllib.parse import quote_plus, urlencode
 from uuid import UUID
 
 from fastapi import APIRouter, Query, status
-from keycloak import urls_patterns
 from starlette.responses import RedirectResponse
 
 from app.config import get_settings
@@ -22,6 +21,37 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/offline-token")
 config = get_settings()
 
+AFTER_CONSENT_REDIRECT_URI = str(config.keycloak.after_consent_redirect_uri)
+ERROR_REDIRECT_TEMPLATE = (
+    AFTER_CONSENT_REDIRECT_URI.replace("{", "{{").replace("}", "}}")
+    + "?error={error}&description={description}"
+)
+
+# everything but the trailing state is static config, so the url is built once;
+# the code is exchanged server side and no id token nonce is checked, so none is sent
+CONSENT_URL_PREFIX = "{}/realms/{}/protocol/openid-connect/auth?{}&state=".format(
+    config.keycloak.issuer,
+    config.keycloak.realm,
+    urlencode(
+        {
+            "client_id": config.keycloak.client_id,
+            "response_type": "code",
+            "redirect_uri": config.keycloak.consent_redirect_uri,
+            "scope": "openid profile email offline_access",
+        }
+    ),
+)
+
+
+def _error_redirect(error: str | None, description: str | None) -> RedirectResponse:
+    """Redirect to the consent feedback page with the error in the query string."""
+    return RedirectResponse(
+        url=ERROR_REDIRECT_TEMPLATE.format(
+            error=quote_plus(error or ""),
+            description=quote_plus(description or ""),
+        )
+    )
+
 
 @router.get(
     "/callback",
@@ -64,10 +94,8 @@ async def offline_token_callback(
         KeycloakError: If Keycloak returns an error or code exchange fails
     """
 
-    url = "{config.keycloak.after_consent_redirect_uri}?error={}&description={}"
-
     if error or error_description:
-        return RedirectResponse(url=url.format(error, error_description))
+        return _error_redirect(error, error_description)
 
     try:
         state_payload = ack_state_service.parse_ack_state(state)
@@ -84,10 +112,10 @@ async def offline_token_callback(
             attributes=None,
         )
     except AuthManagerError as ex:
-        return RedirectResponse(url=url.format(ex.code, ex.message))
+        return _error_redirect(ex.code, ex.message)
 
     return RedirectResponse(
-        url=f"{config.keycloak.after_consent_redirect_uri}",
+        url=AFTER_CONSENT_REDIRECT_URI,
         headers={"x-persistent-token-id": str(stored_entry.id)},
     )
 
@@ -102,7 +130,6 @@ async def offline_token_callback(
 )
 async def request_offline_token_consent(
     validated_token: ValidatedTokenDep,
-    keycloak: KeycloakDep,
     ack_state_service: AckStateDep,
 ) -> Ok[OfflineConsentResult]:
     """Request user consent for offline access.
@@ -113,7 +140,6 @@ async def request_offline_token_consent(
 
     Args:
         validated_token: Validated token with user information (validated by dependency)
-        keycloak: Keycloak service dependency
         state_token_service: State token service dependency
 
     Returns:
@@ -131,19 +157,9 @@ async def request_offline_token_consent(
         session_state_id=session_state_id,
     )
 
-    authorization_endpoint = f"{keycloak.config.issuer}/realms/{keycloak.config.realm}"
-    auth_params = {
-        "authorization-endpoint": f"{authorization_endpoint}/protocol/openid-connect/auth",
-        "client-id": keycloak.config.client_id,
-        "redirect-uri": keycloak.config.consent_redirect_uri,
-        "scope": "openid profile email offline_access",
-        "state": state_token,
-        "nonce": secrets.token_urlsafe(32),  # not required
-    }
-
-    consent_url = urls_patterns.URL_AUTH.format(**auth_params)
+    consent_url = CONSENT_URL_PREFIX + state_token
 
-    return Ok(
+    return Ok.model_construct(
         data=OfflineConsentResult(
             consent_url=consent_url,
             session_state_id=session_state_id,
@@ -78,7 +78,7 @@ async def make_offline_token(
     with guard_invariant(
         new_token_response,
         lambda e: e.refresh_token is None,
-        KeycloakError(
+        lambda: KeycloakError(
             "Could not generate new token",
         ),
     ):
@@ -92,7 +92,7 @@ async def make_offline_token(
             },
         )
 
-        return Ok(
+        return Ok.model_construct(
             data=OfflineTokenResult(
                 persistent_token_id=new_entry.id,
                 session_state_id=new_entry.session_state_id,
@@ -137,36 +137,44 @@ async def revoke_offline_token(
     ):
         entry, _ = await vault.retrieve_and_decrypt(id)
 
-    with guard_auth_error(
-        DatabaseError,
-        "Delete operation failed",
-    ):
-        deleted = await vault.delete_token(entry.id)
+    # the sessions lookup only needs the entry, let it run while the vault is updated
+    sessions_task = asyncio.create_task(keycloak.retrieve_user_sessions(user_id=entry.user_id))
 
-    session_revoked = False
-    with guard_auth_error(
-        KeycloakError,
-        f"Revoke session {entry.session_state_id} for token {entry.id} failed",
-    ):
-        had_shared_session, sessions = await asyncio.gather(
-            vault.is_token_shared(
+    try:
+        with guard_auth_error(
+            DatabaseError,
+            "Delete operation failed",
+        ):
+            deleted, had_shared_session = await vault.delete_and_check_shared(
+                token_id=entry.id,
                 session_state_id=entry.session_state_id,
-                exclude_id=entry.id,
                 token_type=TokenType.OFFLINE,
-            ),
-            keycloak.retrieve_user_sessions(user_id=entry.user_id),
-        )
+            )
 
-        # NOTE: not sure if checking if active session is still there make sense
-        # if the user session id dead, the user can not even make this request
-        # check with the JDC/team
-        if not had_shared_session and not any(
-            session.id == entry.session_state_id for session in sessions
+        session_revoked = False
+        with guard_auth_error(
+            KeycloakError,
+            lambda: f"Revoke session {entry.session_state_id} for token {entry.id} failed",
         ):
-            await keycloak.revoke_session(entry.session_state_id)
-            session_revoked = True
-
-    return Ok(
+            sessions = await sessions_task
+
+            # NOTE: not sure if checking if active session is still there make sense
+            # if the user session id dead, the user can not even make this request
+            # check with the JDC/team
+            session_ids = {session.id for session in sessions}
+            if not had_shared_session and entry.session_state_id not in session_ids:
+                await keycloak.revoke_session(entry.session_state_id)
+                session_revoked = True
+    finally:
+        if sessions_task.done():
+            # a lookup that failed before being awaited must still have its error read
+            if not sessions_task.cancelled():
+                sessions_task.exception()
+        else:
+            # stops the lookup when an earlier step failed
+            sessions_task.cancel()
+
+    return Ok.model_construct(
         data=OfflineTokenRevocationResponse(
             message="Offline token revoked successfully",
             persistent_token_id=entry.id,
@@ -70,7 +70,7 @@ async def store_refresh_token(
             session_state_id=session_id,
         )
 
-    return Ok(
+    return Ok.model_construct(
         data=RefreshTokenIdResult(
             id=new_token_id,
         )
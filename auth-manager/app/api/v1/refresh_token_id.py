@@ -66,7 +66,7 @@ async def make_new_refresh_token_id(
     with guard_invariant(
         entry,
         lambda e: not e.encrypted_token or not e.iv,
-        TokenNotFoundError(
+        lambda: TokenNotFoundError(
             "No encrypted refresh token was found",
             ErrorKeys.token_not_found.name,
         ),
@@ -76,7 +76,7 @@ async def make_new_refresh_token_id(
     with guard_invariant(
         new_token_response,
         lambda e: e.refresh_token is None,
-        KeycloakError("No refresh token was generated"),
+        lambda: KeycloakError("No refresh token was generated"),
     ):
         new_token_id = await vault.upsert_refresh_token(
             user_id=user_id,
@@ -85,7 +85,7 @@ async def make_new_refresh_token_id(
             attributes=None,
         )
 
-        return Ok(
+        return Ok.model_construct(
             data=RefreshTokenIdResult(
                 id=new_token_id,
             )
@@ -3,7 +3,6 @@
 from fastapi import APIRouter, status
 
 from app.core.exceptions import TokenNotActiveError
-from app.core.guards import guard_invariant
 from app.core.logging import get_logger
 from app.core.security import BearerToken
 from app.dependencies import KeycloakDep
@@ -31,11 +30,7 @@ async def validate_token(
 
     introspection_result = await keycloak.introspect_token(token)
 
-    with guard_invariant(
-        introspection_result,
-        lambda e: not e.active,
-        TokenNotActiveError("Token is not active"),
-    ):
-        pass
+    if not introspection_result.active:
+        raise TokenNotActiveError("Token is not active")
 
-    return Ok(data=TokenValidationResponse(valid=True))
+    return Ok.model_construct(data=TokenValidationResponse(valid=True))
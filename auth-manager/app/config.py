@@ -25,9 +25,9 @@ class DatabaseSettings(BaseSettings):
     host: str = "db"
     port: int = 5432
 
-    pool_size: int = Field(default=10, ge=1, le=100, description="Database connection pool size")
+    pool_size: int = Field(default=20, ge=1, le=100, description="Database connection pool size")
     max_overflow: int = Field(
-        default=20,
+        default=10,
         ge=0,
         le=100,
         description="Maximum number of connections that can be created beyond pool_size",
@@ -38,6 +38,18 @@ class DatabaseSettings(BaseSettings):
         le=300,
         description="Timeout in seconds for getting a connection from the pool",
     )
+    pool_recycle: int = Field(
+        default=3600,
+        ge=-1,
+        description="Recycle connections older than this many seconds (-1 disables)",
+    )
+    pool_pre_ping: bool = Field(
+        default=True, description="Check connections for liveness before handing them out"
+    )
+    null_pool: bool = Field(
+        default=False,
+        description="Disable application side pooling (e.g. when running behind PgBouncer)",
+    )
     echo: bool = Field(default=False, description="Enable SQLAlchemy query logging")
 
     @model_validator(mode="after")
@@ -78,6 +90,21 @@ class KeycloakSettings(BaseSettings):
     after_consent_redirect_uri: AnyHttpUrl = Field(
         ..., description="Redirect url after consent confirmed by the user"
     )
+    jwks_cache_ttl: int = Field(
+        default=3600, ge=0, description="Seconds to cache the realm signing keys (JWKS)"
+    )
+    introspection_cache_ttl: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Max seconds to reuse an active token introspection result (0 disables); "
+            "a session revoked outside this process is still accepted for up to this long"
+        ),
+    )
+    local_token_validation: bool = Field(
+        default=False,
+        description="Verify access tokens against the cached JWKS instead of introspecting them",
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="KEYCLOAK_",
@@ -206,16 +233,13 @@ class AppSettings(BaseSettings):
         return v_upper
 
 
-_settings: AppSettings | None = None
-
-
 @cache
 def get_settings() -> AppSettings:
     """
     Get the global settings instance.
 
-    This function implements a singleton pattern to ensure settings
-    are loaded only once and reused across the application.
+    The result is cached, so the environment is read only once and the
+    same instance is reused across the application.
 
     Returns:
         AppSettings: The application settings instance
@@ -223,7 +247,4 @@ def get_settings() -> AppSettings:
     Raises:
         ValidationError: If required environment variables are missing or invalid
     """
-    global _settings
-    if _settings is None:
-        _settings = AppSettings()
-    return _settings
+    return AppSettings()
@@ -1,45 +1,19 @@
 """Guard context managers for common validation patterns."""
 
-from contextlib import contextmanager
-from typing import Callable, Iterator, Type, TypeVar
-
-from sqlalchemy.exc import NoResultFound
+from types import TracebackType
+from typing import Callable, Generic, Type, TypeVar
 
 from app.core.errors import ErrorKeys
 from app.core.exceptions import AuthManagerError
 
 T = TypeVar("T")
 
+# exceptions (or their messages) may be given as zero-argument factories so that
+# they are only built when the guard actually fails
+ExcOrFactory = Exception | Callable[[], Exception]
 
-@contextmanager
-def guard_raise_if_not_found(
-    exc: Exception,
-) -> Iterator[None]:
-    """Guard that raises error when database query returns no results.
-
-    Args:
-        error_message: Error message to raise
-        error_code: Error code for the exception
-
-    Yields:
-        None
-
-    Raises:
-        Exception: If NoResultFound is raised
 
-    """
-    try:
-        yield
-    except NoResultFound as err:
-        raise exc from err
-
-
-@contextmanager
-def guard_invariant(
-    value: T,
-    condition: Callable[[T], bool],
-    exc: Exception,
-) -> Iterator[T]:
+class InvariantGuard(Generic[T]):
     """
     Invariant guard
 
@@ -48,52 +22,91 @@ def guard_invariant(
     Args:
         value: Any object to guard
         condition: Callable that returns True if invariant is violated
-        exc: Exception to raise on violation
+        exc: Exception to raise on violation, or a factory building it
 
-    Yields:
-        The original `value`
+    Returns:
+        The original `value`, from `__enter__`
 
     Example:
-        with guard_invariant(entry, lambda e: e.token is None, ValidationError(...)) as e:
+        with guard_invariant(entry, lambda e: e.token is None, lambda: ValidationError(...)) as e:
             reveal_type(e.token)  # str, not Optional[str]
     """
-    if condition(value):
-        raise exc
-    # TODO: find the solution to narrow down the value type
-    # as checked None value
-    yield value
-
-
-@contextmanager
-def guard_auth_error(
-    exc: Type[AuthManagerError] | None,
-    error_message: str,
-    error_code: str | None = None,
-) -> Iterator[None]:
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: T, condition: Callable[[T], bool], exc: ExcOrFactory) -> None:
+        if condition(value):
+            raise exc if isinstance(exc, BaseException) else exc()
+        self.value = value
+
+    def __enter__(self) -> T:
+        # TODO: find the solution to narrow down the value type
+        # as checked None value
+        return self.value
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class AuthErrorGuard:
     """
     Wrap a block and re-raise any exception as the specified exception type.
 
     Args:
         exc: AuthManagerError
-
-    Yields:
-        None
+        error_message: Message to use, or a factory formatting it on failure
 
     Raises:
         Exception
     """
-    try:
-        yield
-    except AuthManagerError as ex:
-        if exc:
-            raise exc(error_message)
-        raise AuthManagerError(
-            message=ex.message or error_message,
-            code=ex.code,
-            details=ex.details,
-        ) from ex
-    except Exception as ex:
+
+    __slots__ = ("exc", "error_message", "error_code")
+
+    def __init__(
+        self,
+        exc: Type[AuthManagerError] | None,
+        error_message: str | Callable[[], str],
+        error_code: str | None = None,
+    ) -> None:
+        self.exc = exc
+        self.error_message = error_message
+        self.error_code = error_code
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if not isinstance(exc_value, Exception):
+            return None
+
+        error_message = self.error_message
+        message = error_message if isinstance(error_message, str) else error_message()
+
+        if isinstance(exc_value, AuthManagerError):
+            if self.exc:
+                raise self.exc(message)
+            raise AuthManagerError(
+                message=exc_value.message or message,
+                code=exc_value.code,
+                details=exc_value.details,
+            ) from exc_value
+
         raise AuthManagerError(
-            message=str(ex) or error_message,
-            code=error_code or ErrorKeys.internal_error.name,
-        ) from ex
+            message=str(exc_value) or message,
+            code=self.error_code or ErrorKeys.internal_error.name,
+        ) from exc_value
+
+
+# call sites use the guards as plain `with guard_...(...)` helpers
+guard_invariant = InvariantGuard
+guard_auth_error = AuthErrorGuard
@@ -6,7 +6,6 @@ from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.core.exceptions import InvalidRequestError, TokenNotActiveError, UnauthorizedError
-from app.core.guards import guard_invariant
 from app.core.logging import get_logger
 from app.dependencies import get_keycloak_service
 from app.models.domain import ValidatedToken
@@ -34,18 +33,10 @@ async def get_bearer_token(
 
     """
 
-    with guard_invariant(
-        credentials, lambda e: e is None, UnauthorizedError("Authorization header is required")
-    ):
-        assert credentials is not None
-        with guard_invariant(
-            credentials,
-            lambda e: "scheme" in e and e.scheme.lower() != "bearer",
-            UnauthorizedError(
-                "Invalid authentication scheme. Expected: Bearer",
-            ),
-        ):
-            pass
+    if credentials is None:
+        raise UnauthorizedError("Authorization header is required")
+    if credentials.scheme.lower() != "bearer":
+        raise UnauthorizedError("Invalid authentication scheme. Expected: Bearer")
 
     return credentials.credentials
 
@@ -73,46 +64,26 @@ async def get_validated_token(
 
     """
 
-    with guard_invariant(
-        credentials, lambda e: e is None, UnauthorizedError("Authorization header is required")
-    ):
-        assert credentials is not None
-        with guard_invariant(
-            credentials,
-            lambda e: "scheme" in e and e.scheme.lower() != "bearer",
-            "Invalid authentication scheme. Expected: Bearer",
-        ):
-            pass
+    if credentials is None:
+        raise UnauthorizedError("Authorization header is required")
+    if credentials.scheme.lower() != "bearer":
+        raise UnauthorizedError("Invalid authentication scheme. Expected: Bearer")
 
     bearer_token = credentials.credentials
-    token_info = await keycloak.introspect_token(bearer_token)
-
-    with guard_invariant(
-        token_info,
-        lambda e: not e.active,
-        TokenNotActiveError("Token is not active", "token_not_active"),
-    ):
-        ...
-
-    with guard_invariant(
-        token_info,
-        lambda e: e.sub is None,
-        InvalidRequestError("Token missing required claim: sub"),
-    ):
-        assert token_info.sub is not None
-        user_id = token_info.sub
-
-    with guard_invariant(
-        token_info,
-        lambda e: e.sid is None,
-        InvalidRequestError("Token missing required claim: session_state"),
-    ):
-        assert token_info.sid is not None
-        return ValidatedToken(
-            user_id=user_id,
-            session_state_id=token_info.sid,
-            access_token=bearer_token,
-        )
+    token_info = await keycloak.validate_token_local(bearer_token)
+
+    if not token_info.active:
+        raise TokenNotActiveError("Token is not active", "token_not_active")
+    if token_info.sub is None:
+        raise InvalidRequestError("Token missing required claim: sub")
+    if token_info.sid is None:
+        raise InvalidRequestError("Token missing required claim: session_state")
+
+    return ValidatedToken(
+        user_id=token_info.sub,
+        session_state_id=token_info.sid,
+        access_token=bearer_token,
+    )
 
 
 ValidatedTokenDep = Annotated[ValidatedToken, Depends(get_validated_token)]
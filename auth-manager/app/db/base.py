@@ -2,12 +2,14 @@
 
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 
 class DatabaseSessionProvider:
@@ -20,20 +22,37 @@ class DatabaseSessionProvider:
     def init(
         self,
         database_url: str,
-        pool_size: int = 10,
-        max_overflow: int = 20,
+        pool_size: int = 20,
+        max_overflow: int = 10,
         pool_timeout: int = 30,
+        pool_recycle: int = 3600,
+        pool_pre_ping: bool = True,
+        null_pool: bool = False,
         echo: bool = False,
     ):
-        """Initialize database engine and session maker."""
-        self._engine = create_async_engine(
-            database_url,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
-            pool_timeout=pool_timeout,
-            echo=echo,
-            future=True,
-        )
+        """Initialize database engine and session maker.
+
+        With `null_pool` connections are opened per checkout and closed on release,
+        pooling is left to an external pooler such as PgBouncer.
+        """
+        if null_pool:
+            self._engine = create_async_engine(
+                database_url,
+                poolclass=NullPool,
+                echo=echo,
+                future=True,
+            )
+        else:
+            self._engine = create_async_engine(
+                database_url,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                echo=echo,
+                future=True,
+            )
 
         self._session_maker = async_sessionmaker(
             self._engine,
@@ -43,6 +62,15 @@ class DatabaseSessionProvider:
             autoflush=False,
         )
 
+    async def server_version(self) -> str:
+        """Get the database server version."""
+        if self._engine is None:
+            raise RuntimeError("Database not initialized")
+
+        async with self._engine.connect() as connection:
+            result = await connection.execute(text("SELECT version();"))
+            return result.scalar_one()
+
     async def close(self):
         """Close database engine."""
         if self._engine:
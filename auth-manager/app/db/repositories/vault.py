@@ -3,7 +3,7 @@
 from typing import List, Optional, cast
 from uuid import UUID
 
-from sqlalchemy import CursorResult, select, update
+from sqlalchemy import CursorResult, exists, select, update
 from sqlalchemy import delete as db_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +14,22 @@ from app.models.domain import VaultEntry
 logger = get_logger(__name__)
 
 
+def _to_entry(row: AuthVault) -> VaultEntry:
+    """Map an `AuthVault` row to a `VaultEntry`."""
+    return VaultEntry(
+        id=row.id,
+        user_id=row.user_id,
+        token_type=row.token_type,
+        encrypted_token=row.encrypted_token,
+        iv=row.iv,
+        token_hash=row.token_hash,
+        attributes=row.attributes,
+        session_state_id=row.session_state_id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
 class VaultRepository:
     """Repository for token vault database operations."""
 
@@ -45,7 +61,7 @@ class VaultRepository:
         await self.session.flush()
         await self.session.refresh(entry)
 
-        return VaultEntry.model_validate(entry)
+        return _to_entry(entry)
 
     async def upsert_refresh_token(
         self,
@@ -56,11 +72,16 @@ class VaultRepository:
         session_state_id: str,
         attributes: Optional[dict] = None,
     ) -> str:
-        """Upsert refresh token (ensure only one per user)."""
+        """Upsert refresh token (ensure only one per user).
+
+        Re-submitting the token already stored for the same session is a no-op.
+        """
 
         existing = await self.retrieve_by_user_id(user_id, TokenType.REFRESH)
 
         if existing:
+            if existing.token_hash == token_hash and existing.session_state_id == session_state_id:
+                return str(existing.id)
             await self.session.execute(
                 update(AuthVault)
                 .where(AuthVault.id == existing.id)
@@ -94,13 +115,44 @@ class VaultRepository:
 
         return cast(CursorResult, result).rowcount > 0
 
+    async def delete_and_check_shared(
+        self,
+        id: UUID,
+        session_state_id: str,
+        token_type: Optional[TokenType] = None,
+    ) -> tuple[bool, bool]:
+        """Delete token by ID and check if other tokens share its session, in one query.
+
+        Returns:
+            Tuple of (deleted, has_shared_session)
+        """
+
+        deleted = db_delete(AuthVault).where(AuthVault.id == id).returning(AuthVault.id).cte()
+        shared = exists().where(
+            AuthVault.session_state_id == session_state_id,
+            AuthVault.id != id,
+        )
+        if token_type:
+            shared = shared.where(AuthVault.token_type == token_type)
+
+        result = await self.session.execute(select(select(deleted.c.id).exists(), shared))
+        is_deleted, has_shared_session = result.one()
+
+        return is_deleted, has_shared_session
+
     async def retrieve(self, token_id: UUID) -> VaultEntry:
         """Retrieve token by persistent token ID."""
 
         result = await self.session.execute(select(AuthVault).where(AuthVault.id == token_id))
         entry = result.scalar_one()
 
-        return VaultEntry.model_validate(entry)
+        return _to_entry(entry)
+
+    async def retrieve_many(self, token_ids: List[UUID]) -> List[VaultEntry]:
+        """Retrieve tokens by persistent token IDs, unknown IDs are skipped."""
+
+        result = await self.session.execute(select(AuthVault).where(AuthVault.id.in_(token_ids)))
+        return [_to_entry(e) for e in result.scalars().all()]
 
     async def retrieve_by_user_id(
         self, user_id: UUID, token_type: Optional[TokenType] = None
@@ -114,7 +166,7 @@ class VaultRepository:
 
         result = await self.session.execute(query)
         entry = result.scalar_one_or_none()
-        return VaultEntry.model_validate(entry) if entry else None
+        return _to_entry(entry) if entry else None
 
     async def retrieve_by_session_state_or_panic(
         self,
@@ -130,7 +182,7 @@ class VaultRepository:
         result = await self.session.execute(query)
         entry = result.scalar_one()
 
-        return VaultEntry.model_validate(entry)
+        return _to_entry(entry)
 
     async def retrieve_by_session_state_id(
         self,
@@ -146,22 +198,4 @@ class VaultRepository:
         result = await self.session.execute(query)
         entry = result.scalar_one_or_none()
 
-        return VaultEntry.model_validate(entry) if entry else None
-
-    async def retrieve_all_by_session_state_id(
-        self,
-        session_state_id: str,
-        exclude_id: Optional[UUID] = None,
-        token_type: Optional[TokenType] = None,
-    ) -> List[VaultEntry]:
-        """Get all tokens with matching session state ID."""
-
-        query = select(AuthVault).where(AuthVault.session_state_id == session_state_id)
-        if exclude_id:
-            query = query.where(AuthVault.id != exclude_id)
-        if token_type:
-            query = query.where(AuthVault.token_type == token_type)
-
-        result = await self.session.execute(query)
-        entries = result.scalars().all()
-        return [VaultEntry.model_validate(e) for e in entries]
+        return _to_entry(entry) if entry else None
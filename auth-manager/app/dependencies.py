@@ -4,12 +4,15 @@ This module provides dependency injection functions for routes.
 
 """
 
-from typing import Annotated, AsyncGenerator
+from functools import cache
+from typing import Annotated, AsyncGenerator, Awaitable, Callable
+from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.logging import get_logger
 from app.db.base import db_manager
 from app.db.repositories.vault import VaultRepository
 from app.services.ack_state import AcknowledgementKeycloakStateService
@@ -17,6 +20,8 @@ from app.services.encryption import EncryptionService
 from app.services.keycloak import KeycloakService
 from app.services.vault import VaultService
 
+logger = get_logger(__name__)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield a database session, to be used as a dependency."""
@@ -24,20 +29,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@cache
 def get_encryption_service() -> EncryptionService:
-    """Dependency for getting the encryption service."""
+    """Dependency for getting the encryption service, built once per process."""
     settings = get_settings()
     return EncryptionService(settings.encryption.token_vault_encryption_key)
 
 
+@cache
 def get_keycloak_service() -> KeycloakService:
-    """Dependency for getting the Keycloak service."""
+    """Dependency for getting the Keycloak service, built once per process."""
     settings = get_settings()
     return KeycloakService(settings.keycloak)
 
 
+@cache
 def get_ack_state_service() -> AcknowledgementKeycloakStateService:
-    """Dependency for getting the state token service."""
+    """Dependency for getting the state token service, built once per process."""
     settings = get_settings()
     return AcknowledgementKeycloakStateService(secret_key=settings.ack_state.secret)
 
@@ -61,5 +69,39 @@ def get_token_vault_service(
     return VaultService(repository, encryption)
 
 
+async def persist_refresh_token(
+    user_id: UUID,
+    token: str,
+    session_state_id: str,
+    attributes: dict | None,
+) -> None:
+    """Upsert a rotated refresh token using its own database session.
+
+    Meant to run as a background task after the response is sent, when the
+    request scoped session is already closed, so a dedicated one is opened here.
+    """
+    try:
+        async for session in db_manager.session():
+            vault = get_token_vault_service(
+                get_token_vault_repository(session), get_encryption_service()
+            )
+            await vault.upsert_refresh_token(
+                user_id=user_id,
+                token=token,
+                session_state_id=session_state_id,
+                attributes=attributes,
+            )
+    except Exception:
+        logger.exception("refresh_token_upsert_failed", user_id=str(user_id))
+
+
+def get_refresh_token_persister() -> Callable[..., Awaitable[None]]:
+    """Dependency for getting the background refresh token upsert."""
+    return persist_refresh_token
+
+
 TokenVaultRepoDep = Annotated[VaultRepository, Depends(get_token_vault_repository)]
 TokenVaultServiceDep = Annotated[VaultService, Depends(get_token_vault_service)]
+RefreshTokenPersisterDep = Annotated[
+    Callable[..., Awaitable[None]], Depends(get_refresh_token_persister)
+]
@@ -1,8 +1,10 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import ValidationError as PydanticValidationError
 from scalar_fastapi import Layout, get_scalar_api_reference
 
@@ -18,13 +20,18 @@ from app.core.exceptions_handler import (
 )
 from app.core.logging import configure_logging, get_logger
 from app.db.base import db_manager
+from app.dependencies import get_keycloak_service
 from app.middleware import LoggingMiddleware, RequestIDMiddleware
+from app.services.keycloak import KeycloakService
 
 logger = get_logger(__name__)
 
 
 config = get_settings()
 
+# startup probes are best effort, do not let an unreachable dependency hold up serving
+STARTUP_PROBE_TIMEOUT = 5
+
 
 def make_logger():
     configure_logging(config.log_level)
@@ -38,19 +45,35 @@ def make_database():
         pool_size=config.database.pool_size,
         max_overflow=config.database.max_overflow,
         pool_timeout=config.database.pool_timeout,
+        pool_recycle=config.database.pool_recycle,
+        pool_pre_ping=config.database.pool_pre_ping,
+        null_pool=config.database.null_pool,
         echo=config.database.echo,
     )
     logger.info("database_initialized")
 
 
+async def make_keycloak_warmup(keycloak: KeycloakService):
+    """Warm up Keycloak connections so the first request does not pay for them."""
+    try:
+        await asyncio.wait_for(keycloak.warmup(), timeout=STARTUP_PROBE_TIMEOUT)
+    except Exception as ex:
+        logger.warning("keycloak_warmup_failed", error=str(ex) or type(ex).__name__)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     make_logger()
     make_database()
+    await health.load_database_version(app, timeout=STARTUP_PROBE_TIMEOUT)
+    keycloak = get_keycloak_service()
+    await make_keycloak_warmup(keycloak)
 
     yield
 
     logger.info("shutdown_started")
+    await keycloak.aclose()
+    get_keycloak_service.cache_clear()
     await db_manager.close()
     logger.info("shutdown_complete")
 
@@ -83,6 +106,7 @@ app = FastAPI(
         Exception: generic_exception_handler,
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     root_path=config.root_path,
     docs_url="/docs",
     redoc_url="/redoc",
@@ -1,32 +1,34 @@
 """Domain models."""
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import UUID4, AnyUrl, BaseModel, Field
+from pydantic import AnyUrl, BaseModel, ConfigDict, Field
 
 from app.db.models import TokenType
 
 
-class VaultEntry(BaseModel):
-    """Vault entry domain model."""
+@dataclass(slots=True, frozen=True)
+class VaultEntry:
+    """Vault entry domain model.
 
-    id: UUID4
-    user_id: UUID4
+    A plain dataclass built from `AuthVault` rows by the repository, the
+    columns are already typed by the database so no validation is needed.
+    """
+
+    id: UUID
+    user_id: UUID
     token_type: TokenType
     encrypted_token: Optional[str]
     iv: Optional[str]
     token_hash: Optional[str]
-    attributes: Optional[dict[str, Any]] = None
+    attributes: Optional[dict[str, Any]]
     session_state_id: str
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
-
 
 class KeycloakTokenResponse(BaseModel):
     """Keycloak token endpoint response model."""
@@ -41,6 +43,8 @@ class KeycloakTokenResponse(BaseModel):
     scope: Optional[str] = None
     session_state: str
 
+    model_config = ConfigDict(populate_by_name=True, extra="ignore", frozen=True)
+
 
 class KeycloakUserSessionResponse(BaseModel):
     """Keycloak user session endpoint response model."""
@@ -55,9 +59,9 @@ class KeycloakUserSessionResponse(BaseModel):
     clients: dict[str, str] = Field(alias="clients")
     transient_user: bool = Field(alias="transientUser")
 
-    class Config:
-        populate_by_name = True
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True, populate_by_name=True, extra="ignore", frozen=True
+    )
 
 
 class TokenIntrospection(BaseModel):
@@ -71,14 +75,18 @@ class TokenIntrospection(BaseModel):
     username: Optional[str] = None
     token_type: Optional[str] = None
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
 
-class ValidatedToken(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ValidatedToken:
     """Validated token information from successful introspection.
 
     This model contains the validated user information extracted from
     a bearer token after successful Keycloak introspection. It is used
     by the token validation dependency to provide type-safe access to
-    validated token data in endpoint handlers.
+    validated token data in endpoint handlers. It is a plain dataclass, the
+    claims are already validated by the introspection model.
 
     Attributes:
         user_id: User identifier extracted from the token's 'sub' claim
@@ -86,7 +94,7 @@ class ValidatedToken(BaseModel):
         access_token: The original bearer token for potential downstream use
     """
 
-    user_id: UUID4
+    user_id: UUID
     session_state_id: str
     access_token: str
 
@@ -101,3 +109,5 @@ class TokenPayload(BaseModel):
     azp: Optional[str] = None  # authorized party (client id)
     sid: Optional[str] = None  # session ID
     scope: Optional[str] = None  # scopes (space-separated list)
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
@@ -1,13 +1,29 @@
 """State token generation and parsing service."""
 
-from datetime import datetime, timedelta, timezone
+import base64
+import hmac
+import time
 
-import jwt
+import orjson
 
 from app.core.exceptions import InvalidAckStateError
 from app.models.request import AckStateTokenPayload
 
 
+def _b64url_encode(data: bytes) -> bytes:
+    """Encode bytes as an unpadded base64url JWS segment."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWS segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# every ack state uses the same header, so its encoded segment is built once
+_HEADER = _b64url_encode(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
 class AcknowledgementKeycloakStateService:
     """Service for generating and parsing JWT state tokens."""
 
@@ -17,7 +33,7 @@ class AcknowledgementKeycloakStateService:
         Args:
             secret_key: Secret key for signing JWT tokens
         """
-        self.secret_key = secret_key
+        self._key = secret_key.encode()
 
     def make_ack_state(
         self,
@@ -35,30 +51,37 @@ class AcknowledgementKeycloakStateService:
         Returns:
             JWT token string
         """
-        now = datetime.now(timezone.utc)
+        now = int(time.time())
         payload = {
             "user_id": user_id,
             "session_state_id": session_state_id,
-            "exp": now + timedelta(seconds=expires_in),
+            "exp": now + expires_in,
             "iat": now,
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm="HS256")
+        signing_input = _HEADER + b"." + _b64url_encode(orjson.dumps(payload))
+        signature = _b64url_encode(hmac.digest(self._key, signing_input, "sha256"))
+        return (signing_input + b"." + signature).decode()
 
     def parse_ack_state(self, token: str) -> AckStateTokenPayload:
         """Parse and validate state token without checking expiration."""
 
         try:
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=["HS256"],
-                options={"verify_exp": False},
-            )
+            header, claims, signature = token.split(".")
+            expected = hmac.digest(self._key, f"{header}.{claims}".encode(), "sha256")
+            is_valid = hmac.compare_digest(_b64url_decode(signature), expected)
+        except ValueError as e:
+            raise InvalidAckStateError("Invalid state token") from e
+
+        if not is_valid:
+            raise InvalidAckStateError("Invalid state token")
+
+        try:
+            payload = orjson.loads(_b64url_decode(claims))
             return AckStateTokenPayload(
                 user_id=payload["user_id"], session_state_id=payload["session_state_id"]
             )
-        except jwt.InvalidTokenError as e:
+        except ValueError as e:
             raise InvalidAckStateError("Invalid state token") from e
         except KeyError as e:
             raise InvalidAckStateError("Missing required field in state token") from e
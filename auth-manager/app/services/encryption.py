@@ -3,7 +3,6 @@
 import hashlib
 import secrets
 
-from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 
@@ -27,6 +26,9 @@ class EncryptionService:
         except ValueError as e:
             raise ValueError(f"Encryption key must be valid hex string: {e}")
 
+        # key validation is done once here, only the per-IV mode is built per call
+        self._algorithm = algorithms.AES(self.key)
+
     def generate_iv(self) -> str:
         """Generate a random 16-byte IV and return as hex string.
 
@@ -56,7 +58,7 @@ class EncryptionService:
         if len(iv_bytes) != 16:
             raise ValueError("IV must be 16 bytes (32 hex characters)")
 
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv_bytes), backend=default_backend())
+        cipher = Cipher(self._algorithm, modes.CBC(iv_bytes))
         encryptor = cipher.encryptor()
 
         # Pad token to multiple of 16 bytes using PKCS7
@@ -86,7 +88,7 @@ class EncryptionService:
         if len(iv_bytes) != 16:
             raise ValueError("IV must be 16 bytes (32 hex characters)")
 
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv_bytes), backend=default_backend())
+        cipher = Cipher(self._algorithm, modes.CBC(iv_bytes))
         decryptor = cipher.decryptor()
 
         decrypted = decryptor.update(encrypted_bytes) + decryptor.finalize()
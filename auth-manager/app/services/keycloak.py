@@ -1,7 +1,15 @@
 """Keycloak service using python-keycloak SDK."""
 
+import asyncio
+import hashlib
+import time
+from functools import partial
+
 import httpx
-from keycloak import KeycloakAdmin, KeycloakGetError, KeycloakOpenID, KeycloakPostError
+from jwcrypto import jwk
+from jwcrypto.jwt import JWTMissingKey
+from keycloak import KeycloakGetError, KeycloakOpenID, KeycloakPostError
+from pydantic import TypeAdapter
 
 from app.config import KeycloakSettings
 from app.core.exceptions import KeycloakError
@@ -12,6 +20,54 @@ from app.models.domain import (
     TokenPayload,
 )
 
+# validate raw Keycloak response bodies in one pydantic-core call
+_sessions_adapter = TypeAdapter(list[KeycloakUserSessionResponse])
+_introspection_adapter = TypeAdapter(TokenIntrospection)
+_token_adapter = TypeAdapter(KeycloakTokenResponse)
+
+# seconds before expiry after which a cached admin token is no longer reused
+ADMIN_TOKEN_SKEW = 30
+
+# realm signing keys shared by all service instances, keyed by (issuer, realm),
+# stored with the monotonic time they were fetched at
+_jwks_cache: dict[tuple[str, str], tuple[float, jwk.JWKSet]] = {}
+# minimum seconds between forced refreshes, so tokens with unknown kids can not
+# make every request fetch the realm keys again
+JWKS_REFRESH_MIN_INTERVAL = 30
+
+# active introspection results keyed by sha256 of the token, oldest first
+_introspection_cache: dict[str, tuple[float, TokenIntrospection]] = {}
+# introspection cache keys per session id, so a revoked session is dropped without a scan
+_introspection_sessions: dict[str, set[str]] = {}
+# hard cap, the oldest entry is evicted to make room for a new one
+INTROSPECTION_CACHE_MAX_SIZE = 10_000
+
+
+def _cache_introspection(key: str, expires_at: float, introspection: TokenIntrospection) -> None:
+    """Cache an introspection result, evicting the oldest entry when the cache is full."""
+
+    _evict_introspection(key)
+    if len(_introspection_cache) >= INTROSPECTION_CACHE_MAX_SIZE:
+        _evict_introspection(next(iter(_introspection_cache)))
+
+    _introspection_cache[key] = (expires_at, introspection)
+    if introspection.sid is not None:
+        _introspection_sessions.setdefault(introspection.sid, set()).add(key)
+
+
+def _evict_introspection(key: str) -> None:
+    """Drop a cached introspection result and its session index entry."""
+
+    cached = _introspection_cache.pop(key, None)
+    if cached is None or cached[1].sid is None:
+        return
+
+    keys = _introspection_sessions.get(cached[1].sid)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _introspection_sessions[cached[1].sid]
+
 
 class KeycloakSDKClient:
     """Keycloak SDK client wrapper."""
@@ -19,7 +75,6 @@ class KeycloakSDKClient:
     def __init__(self, settings: KeycloakSettings) -> None:
         self.settings = settings
         self._openid_client: KeycloakOpenID | None = None
-        self._admin_client: KeycloakAdmin | None = None
 
     @property
     def openid(self) -> KeycloakOpenID:
@@ -35,19 +90,6 @@ class KeycloakSDKClient:
             )
         return self._openid_client
 
-    @property
-    def admin(self) -> KeycloakAdmin:
-        """Get or create Admin client."""
-
-        if self._admin_client is None:
-            self._admin_client = KeycloakAdmin(
-                server_url=f"{self.settings.issuer}/",
-                client_id=self.settings.client_id,
-                realm_name=self.settings.realm,
-                client_secret_key=self.settings.client_secret,
-            )
-        return self._admin_client
-
 
 class KeycloakService:
     """Service for interacting with Keycloak using python-keycloak SDK."""
@@ -55,21 +97,74 @@ class KeycloakService:
     def __init__(self, config: KeycloakSettings) -> None:
         self.config = config
         self.client = KeycloakSDKClient(config)
-        self.net = httpx.AsyncClient(timeout=30.0)
+        # shared by all direct REST calls, keep connections alive across requests
+        self.net = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=200,
+                keepalive_expiry=60,
+            ),
+        )
+        self._admin_token: str | None = None
+        self._admin_token_exp: float = 0
+        self._admin_lock = asyncio.Lock()
+        self._jwks_lock = asyncio.Lock()
+
+        openid_url = f"{config.issuer}/realms/{config.realm}/protocol/openid-connect"
+        self._token_url = f"{openid_url}/token"
+        self._introspect_url = f"{openid_url}/token/introspect"
+
+    async def warmup(self) -> None:
+        """Open the pooled connection and prime the realm keys and admin token caches."""
+
+        results = await asyncio.gather(
+            self.net.head(self.config.issuer),
+            self.signing_keys(),
+            self._get_admin_token(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.net.aclose()
+
+    async def _post_openid_form(self, url: str, data: dict[str, str], error: str) -> bytes:
+        """POST a client-authenticated form to an OpenID endpoint and return the raw body."""
+
+        response = await self.net.post(
+            url,
+            data={
+                "client_id": self.config.client_id,
+                "client_secret": self.config.client_secret,
+                **data,
+            },
+        )
 
-    async def refresh_access_token(self, refresh_token: str) -> KeycloakTokenResponse:
-        """Refresh access token using refresh token."""
-        try:
-            result = await self.client.openid.a_refresh_token(refresh_token)
-            return KeycloakTokenResponse(**result)
-        except KeycloakPostError as e:
+        if response.status_code not in [200]:
             raise KeycloakError(
-                "Token refresh failed",
+                error,
                 details={
-                    "code": e.response_code,
-                    "body": e.response_body,
+                    "code": response.status_code,
+                    "body": response.text,
                 },
-            ) from e
+            )
+
+        return response.content
+
+    async def refresh_access_token(self, refresh_token: str) -> KeycloakTokenResponse:
+        """Refresh access token using refresh token."""
+
+        content = await self._post_openid_form(
+            self._token_url,
+            {"grant_type": "refresh_token", "refresh_token": refresh_token},
+            "Token refresh failed",
+        )
+        return _token_adapter.validate_json(content)
 
     async def request_offline_token(self, offline_token: str) -> KeycloakTokenResponse:
         """Request offline token with offline_access scope."""
@@ -90,28 +185,80 @@ class KeycloakService:
             ) from e
 
     async def introspect_token(self, token: str) -> TokenIntrospection:
-        """Introspect token to check if it's active."""
+        """Introspect token to check if it's active.
+
+        When `introspection_cache_ttl` is set, active results are reused for up to
+        that many seconds, never past the token expiry. Off by default, as sessions
+        revoked by other workers or in Keycloak itself are not seen until then.
+        """
+
+        ttl = self.config.introspection_cache_ttl
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = _introspection_cache.get(cache_key)
+        if cached:
+            if time.monotonic() < cached[0]:
+                return cached[1]
+            _evict_introspection(cache_key)
+
+        content = await self._post_openid_form(
+            self._introspect_url, {"token": token}, "Token introspection failed"
+        )
+        introspection = _introspection_adapter.validate_json(content)
+
+        if ttl and introspection.active:
+            if introspection.exp is not None:
+                ttl = min(ttl, introspection.exp - int(time.time()))
+            if ttl > 0:
+                _cache_introspection(cache_key, time.monotonic() + ttl, introspection)
+
+        return introspection
+
+    async def validate_token_local(self, token: str) -> TokenIntrospection:
+        """Validate token against the cached realm keys, without calling Keycloak.
+
+        Only used when `local_token_validation` is enabled. Falls back to
+        `introspect_token` whenever the token can not be verified locally, so a
+        rejected token still gets the authoritative answer from Keycloak.
+        """
+
+        if not self.config.local_token_validation:
+            return await self.introspect_token(token)
 
         try:
-            result = await self.client.openid.a_introspect(token)
-            return TokenIntrospection(**result)
-        except KeycloakPostError as e:
-            raise KeycloakError(
-                "Token introspection failed",
-                details={
-                    "code": e.response_code,
-                    "body": e.response_body,
+            claims = await self._verify_token(
+                token,
+                check_claims={
+                    "iss": f"{self.config.issuer}/realms/{self.config.realm}",
+                    "typ": "Bearer",
+                    "exp": None,
+                    "sub": None,
                 },
-            ) from e
+                # the SDK accepts tokens up to 60s past exp, introspection does not
+                leeway=0,
+            )
+            return TokenIntrospection(
+                active=True,
+                exp=claims["exp"],
+                iat=claims.get("iat"),
+                sub=claims["sub"],
+                sid=claims.get("sid") or claims.get("session_state"),
+                scope=claims.get("scope"),
+                client_id=claims.get("azp"),
+                username=claims.get("preferred_username"),
+                token_type=claims["typ"],
+            )
+        except Exception:
+            return await self.introspect_token(token)
 
     async def decode_token(self, token: str, validate: bool = False) -> TokenPayload:
-        """Introspect token to check if it's active."""
+        """Decode token, verifying its signature against the realm keys when `validate` is set."""
 
         try:
-            result = await self.client.openid.a_decode_token(
-                token,
-                validate=validate,
-            )
+            if not validate:
+                result = await self.client.openid.a_decode_token(token, validate=False)
+                return TokenPayload(**result)
+
+            result = await self._verify_token(token)
             return TokenPayload(**result)
         except KeycloakPostError as e:
             raise KeycloakError(
@@ -122,6 +269,58 @@ class KeycloakService:
                 },
             ) from e
 
+    async def _verify_token(self, token: str, **kwargs) -> dict:
+        """Verify token signature (and any jwcrypto `check_claims`), return its claims."""
+
+        # signature verification is CPU bound, keep it off the event loop
+        verify = partial(self.client.openid.decode_token, token, validate=True, **kwargs)
+        try:
+            keys = await self.signing_keys()
+            return await asyncio.to_thread(verify, key=keys)
+        except JWTMissingKey:
+            # unknown kid, the realm keys were probably rotated
+            keys = await self.signing_keys(refresh=True)
+            return await asyncio.to_thread(verify, key=keys)
+
+    async def signing_keys(self, refresh: bool = False) -> jwk.JWKSet:
+        """Get the realm public keys (JWKS), cached for `jwks_cache_ttl` seconds.
+
+        `refresh` only refetches keys older than `JWKS_REFRESH_MIN_INTERVAL` seconds.
+        """
+
+        cache_key = (self.config.issuer, self.config.realm)
+        max_age = self.config.jwks_cache_ttl
+        if refresh:
+            max_age = min(max_age, JWKS_REFRESH_MIN_INTERVAL)
+
+        cached = _jwks_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        async with self._jwks_lock:
+            # another request may have refetched them while this one was waiting
+            cached = _jwks_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+
+            try:
+                certs = await self.client.openid.a_certs()
+            except KeycloakGetError as e:
+                raise KeycloakError(
+                    "Fetch realm certificates failed",
+                    details={
+                        "code": e.response_code,
+                        "body": e.response_body,
+                    },
+                ) from e
+
+            keys = jwk.JWKSet()
+            for cert in certs["keys"]:
+                keys.add(jwk.JWK(**cert))
+
+            _jwks_cache[cache_key] = (time.monotonic(), keys)
+            return keys
+
     async def revoke_session(self, session_id: str) -> None:
         """Revoke Keycloak session using admin API."""
 
@@ -137,22 +336,26 @@ class KeycloakService:
                 details={"error": response.text},
             )
 
+        # tokens of the revoked session must not keep passing as active
+        for key in list(_introspection_sessions.get(session_id, ())):
+            _evict_introspection(key)
+
     async def retrieve_user_sessions(self, user_id: str) -> list[KeycloakUserSessionResponse]:
         """Retrieve all user sessions (except offline)"""
 
-        try:
-            result = await self.client.admin.a_get_sessions(
-                user_id=user_id,
-            )
-            return [KeycloakUserSessionResponse(**session) for session in result]
-        except KeycloakGetError as e:
+        url = f"{self.config.issuer}/admin/realms/{self.config.realm}/users/{user_id}/sessions"
+        admin_token = await self._get_admin_token()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        response = await self.net.get(url, headers=headers)
+
+        if response.status_code not in [200]:
             raise KeycloakError(
-                "Fetch user session failed",
-                details={
-                    "code": e.response_code,
-                    "body": e.response_body,
-                },
-            ) from e
+                message="Fetch user session failed",
+                details={"error": response.text},
+            )
+
+        return _sessions_adapter.validate_json(response.content)
 
     async def retrieve_user_offline_sessions(
         self, user_id: str
@@ -173,7 +376,22 @@ class KeycloakService:
                 details={"error": response.text},
             )
 
-        return [KeycloakUserSessionResponse(**session) for session in response.json()]
+        return _sessions_adapter.validate_json(response.content)
+
+    async def retrieve_all_sessions(
+        self, user_id: str
+    ) -> tuple[list[KeycloakUserSessionResponse], list[KeycloakUserSessionResponse]]:
+        """Retrieve the user sessions and offline sessions concurrently.
+
+        Returns:
+            Tuple of (sessions, offline_sessions)
+        """
+
+        sessions, offline_sessions = await asyncio.gather(
+            self.retrieve_user_sessions(user_id),
+            self.retrieve_user_offline_sessions(user_id),
+        )
+        return sessions, offline_sessions
 
     async def exchange_code_for_token(self, code: str, redirect_uri: str) -> KeycloakTokenResponse:
         """Exchange authorization code for tokens."""
@@ -196,16 +414,27 @@ class KeycloakService:
             ) from e
 
     async def _get_admin_token(self) -> str:
-        """Get admin access token for admin API calls."""
-
-        try:
-            result = await self.client.openid.a_token(grant_type="client_credentials")
+        """Get admin access token for admin API calls, reused until shortly before it expires."""
+
+        if self._admin_token and time.monotonic() < self._admin_token_exp - ADMIN_TOKEN_SKEW:
+            return self._admin_token
+
+        async with self._admin_lock:
+            # another request may have refreshed it while this one was waiting
+            if self._admin_token and time.monotonic() < self._admin_token_exp - ADMIN_TOKEN_SKEW:
+                return self._admin_token
+
+            try:
+                result = await self.client.openid.a_token(grant_type="client_credentials")
+            except KeycloakPostError as e:
+                raise KeycloakError(
+                    "Admin token request failed",
+                    details={
+                        "code": e.response_code,
+                        "body": e.response_body,
+                    },
+                ) from e
+
+            self._admin_token = result["access_token"]
+            self._admin_token_exp = time.monotonic() + result.get("expires_in", 0)
             return result["access_token"]
-        except KeycloakPostError as e:
-            raise KeycloakError(
-                "Admin token request failed",
-                details={
-                    "code": e.response_code,
-                    "body": e.response_body,
-                },
-            ) from e
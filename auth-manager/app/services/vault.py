@@ -3,8 +3,9 @@
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy.exc import NoResultFound
+
 from app.core.exceptions import DatabaseError, TokenNotFoundError, ValidationError
-from app.core.guards import guard_invariant, guard_raise_if_not_found
 from app.core.logging import get_logger
 from app.db.models import TokenType
 from app.db.repositories.vault import VaultRepository
@@ -21,6 +22,33 @@ class VaultService:
         self.repository = repository
         self.encryption = encryption
 
+    def _seal(self, token: str) -> tuple[str, str, str]:
+        """Encrypt and hash a token under a fresh IV.
+
+        Args:
+            token: Token string to seal
+
+        Returns:
+            Tuple of (iv, encrypted_token, token_hash)
+        """
+
+        iv = self.encryption.generate_iv()
+        return iv, self.encryption.encrypt_token(token, iv), self.encryption.hash_token(token)
+
+    def _open(self, entry: VaultEntry) -> str:
+        """Decrypt a vault entry's token.
+
+        Args:
+            entry: Vault entry carrying the encrypted token and IV
+
+        Returns:
+            Decrypted token string
+        """
+
+        assert entry.encrypted_token is not None
+        assert entry.iv is not None
+        return self.encryption.decrypt_token(entry.encrypted_token, entry.iv)
+
     async def store(
         self,
         user_id: UUID,
@@ -42,9 +70,7 @@ class VaultService:
             VaultEntry with stored token information
         """
 
-        iv = self.encryption.generate_iv()
-        encrypted_token = self.encryption.encrypt_token(token, iv)
-        token_hash = self.encryption.hash_token(token)
+        iv, encrypted_token, token_hash = self._seal(token)
 
         result = await self.repository.create(
             user_id=user_id,
@@ -74,20 +100,40 @@ class VaultService:
             TokenNotFoundError: If token not found or has no encrypted data
         """
 
-        with guard_raise_if_not_found(TokenNotFoundError("Token not found")):
+        try:
             entry = await self.repository.retrieve(token_id)
+        except NoResultFound as e:
+            raise TokenNotFoundError("Token not found") from e
 
-        with guard_invariant(
-            entry,
-            lambda e: not e.encrypted_token or not e.iv,
-            TokenNotFoundError("Token has no encrypted data"),
-        ) as en:
-            assert en.encrypted_token is not None
-            assert en.iv is not None
-            decrypted_token = self.encryption.decrypt_token(en.encrypted_token, en.iv)
+        if not entry.encrypted_token or not entry.iv:
+            raise TokenNotFoundError("Token has no encrypted data")
 
+        decrypted_token = self._open(entry)
         return entry, decrypted_token
 
+    async def retrieve_many(self, token_ids: list[UUID]) -> list[tuple[VaultEntry, str]]:
+        """Retrieve and decrypt several tokens with a single query.
+
+        Args:
+            token_ids: Persistent token IDs (UUID)
+
+        Returns:
+            List of (VaultEntry, decrypted_token_string) for the tokens found
+
+        Raises:
+            TokenNotFoundError: If a found token has no encrypted data
+        """
+
+        if not token_ids:
+            return []
+
+        entries = await self.repository.retrieve_many(token_ids)
+        for entry in entries:
+            if not entry.encrypted_token or not entry.iv:
+                raise TokenNotFoundError("Token has no encrypted data")
+
+        return [(entry, self._open(entry)) for entry in entries]
+
     async def upsert_refresh_token(
         self,
         user_id: UUID,
@@ -107,9 +153,7 @@ class VaultService:
             Persistent token ID (UUID as string)
         """
 
-        iv = self.encryption.generate_iv()
-        encrypted_token = self.encryption.encrypt_token(token, iv)
-        token_hash = self.encryption.hash_token(token)
+        iv, encrypted_token, token_hash = self._seal(token)
 
         return await self.repository.upsert_refresh_token(
             user_id=user_id,
@@ -143,24 +187,20 @@ class VaultService:
             TokenNotFoundError: If the found entry has missing encryption data.
         """
 
-        with guard_raise_if_not_found(
-            DatabaseError("No token found for the session/type requested", "entity_not_found"),
-        ):
+        try:
             entry = await self.repository.retrieve_by_session_state_or_panic(
                 session_state_id, token_type
             )
+        except NoResultFound as e:
+            raise DatabaseError(
+                "No token found for the session/type requested", "entity_not_found"
+            ) from e
 
-        with guard_invariant(
-            entry,
-            lambda e: not e.encrypted_token or not e.iv,
-            TokenNotFoundError(
-                "Token has no encrypted data",
-            ),
-        ) as e:
-            assert e.encrypted_token is not None
-            assert e.iv is not None
-            decrypted_token = self.encryption.decrypt_token(e.encrypted_token, e.iv)
-            return entry, decrypted_token
+        if not entry.encrypted_token or not entry.iv:
+            raise TokenNotFoundError("Token has no encrypted data")
+
+        decrypted_token = self._open(entry)
+        return entry, decrypted_token
 
     async def retrieve_by_session_state_id(
         self,
@@ -180,9 +220,7 @@ class VaultService:
         entry = await self.repository.retrieve_by_session_state_id(session_state_id, token_type)
 
         if entry:
-            assert entry.encrypted_token is not None
-            assert entry.iv is not None
-            decrypted_token = self.encryption.decrypt_token(entry.encrypted_token, entry.iv)
+            decrypted_token = self._open(entry)
             return entry, decrypted_token
 
         return None
@@ -198,23 +236,21 @@ class VaultService:
 
         Returns:
             Tuple of (VaultEntry, decrypted_token) or None if not found
+
+        Raises:
+            DatabaseError: If no token is found for the user and token type
+            ValidationError: If the found entry has missing encryption data
         """
 
-        with guard_raise_if_not_found(DatabaseError("No Token found for the user/type requested")):
-            entry = await self.repository.retrieve_by_user_id(user_id, token_type)
-            assert entry
-
-        with guard_invariant(
-            entry,
-            lambda e: not e.encrypted_token or not e.iv,
-            ValidationError(
-                "Token has no encrypted data",
-            ),
-        ) as en:
-            assert en.encrypted_token is not None
-            assert en.iv is not None
-            decrypted_token = self.encryption.decrypt_token(en.encrypted_token, en.iv)
-            return en, decrypted_token
+        entry = await self.repository.retrieve_by_user_id(user_id, token_type)
+        if entry is None:
+            raise DatabaseError("No Token found for the user/type requested")
+
+        if not entry.encrypted_token or not entry.iv:
+            raise ValidationError("Token has no encrypted data")
+
+        decrypted_token = self._open(entry)
+        return entry, decrypted_token
 
     async def delete_token(
         self,
@@ -231,24 +267,21 @@ class VaultService:
 
         return await self.repository.delete(token_id)
 
-    async def is_token_shared(
-        self, session_state_id: str, exclude_id: UUID, token_type: TokenType | None = None
-    ) -> bool:
-        """Check if token is shared by hash or session.
+    async def delete_and_check_shared(
+        self,
+        token_id: UUID,
+        session_state_id: str,
+        token_type: TokenType | None = None,
+    ) -> tuple[bool, bool]:
+        """Delete a token and check if other tokens share its session.
 
         Args:
-            token_hash: SHA-256 hash of the token
-            session_state_id: Keycloak session state identifier
-            exclude_id: Token ID to exclude from search
+            token_id: Persistent token ID (UUID)
+            session_state_id: Keycloak session state identifier of the token
+            token_type: Optional token type the shared tokens must have
 
         Returns:
-            Boolean has_shared_session
+            Tuple of (token_deleted, has_shared_session)
         """
 
-        shared_sessions = await self.repository.retrieve_all_by_session_state_id(
-            session_state_id,
-            exclude_id=exclude_id,
-            token_type=token_type,
-        )
-
-        return len(shared_sessions) > 0
+        return await self.repository.delete_and_check_shared(token_id, session_state_id, token_type)